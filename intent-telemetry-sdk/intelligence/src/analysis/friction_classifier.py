@@ -2,177 +2,185 @@
 Friction pattern classifier
 """
 
-from datetime import datetime
 from typing import List
-from src.models.event import TelemetryEvent, EventType
-from src.models.session import FrictionPattern
-from src.analysis.session_reconstructor import ReconstructedSession
+import numpy as np
+from src.models.event import EventType
+from src.models.session import FrictionPattern, FrictionTemplate, PatternType
+from src.analysis.session_reconstructor import (
+    EventBuckets,
+    ReconstructedSession,
+    SessionArrays,
+    numeric_field,
+)
+from src.analysis.severity_kernels import score_abandonment, score_above, score_capped
 
 
 class FrictionClassifier:
     """Classifies friction patterns from events"""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.patterns: List[FrictionPattern] = []
 
     def analyze_session(self, session: ReconstructedSession) -> List[FrictionPattern]:
         """Analyze session for friction patterns"""
         patterns = []
 
+        # Fetch the type buckets and build the numeric columns once for all detectors
+        buckets = session.get_type_buckets()
+        arrays = SessionArrays.from_buckets(buckets)
+
         # 1. Performance degradation
-        patterns.extend(self._detect_performance_degradation(session))
+        patterns.extend(self._detect_performance_degradation(buckets, arrays))
 
         # 2. Affordance confusion
-        patterns.extend(self._detect_affordance_confusion(session))
+        patterns.extend(self._detect_affordance_confusion(buckets, arrays))
 
         # 3. Cognitive overload (not directly detectable, inferred from patterns)
-        patterns.extend(self._detect_cognitive_overload(session))
+        patterns.extend(self._detect_cognitive_overload(buckets, arrays))
 
         # 4. Expectation mismatch
-        patterns.extend(self._detect_expectation_mismatch(session))
+        patterns.extend(self._detect_expectation_mismatch(buckets))
 
         self.patterns.extend(patterns)
         return patterns
 
     def _detect_performance_degradation(
-        self, session: ReconstructedSession
+        self, buckets: EventBuckets, arrays: SessionArrays
     ) -> List[FrictionPattern]:
         """Detect performance issues"""
         patterns = []
 
         # Check for slow page loads
-        load_events = session.get_events_by_type(EventType.PERFORMANCE_LOAD)
-        for event in load_events:
-            load_time = event.data.get("loadTime", 0)
-            if load_time > 3000:  # > 3 seconds
-                severity = min(1.0, load_time / 10000)  # Scale to 0-1
-                patterns.append(
-                    FrictionPattern(
-                        pattern_type="performance_degradation",
-                        severity=severity,
-                        timestamp=event.timestamp,
-                        description=f"Slow page load detected: {load_time}ms",
-                        event_id=event.eventId,
-                    )
+        load_events = buckets.get(EventType.PERFORMANCE_LOAD, ())
+        # > 3 seconds is slow; severity scales to 0-1 at 10 seconds
+        slow, severities = score_above(arrays.load_time, 3000.0, 10000.0)
+        for idx in np.flatnonzero(slow):
+            event = load_events[idx]
+            load_time = numeric_field(event.data, "loadTime", 0)
+            patterns.append(
+                FrictionPattern(
+                    pattern_type=PatternType.PERFORMANCE_DEGRADATION,
+                    severity=float(severities[idx]),
+                    timestamp=event.timestamp,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.SLOW_LOAD,
+                    template_args=(str(load_time),),
                 )
+            )
 
         # Check for high latency interactions
-        latency_events = session.get_events_by_type(EventType.PERFORMANCE_LATENCY)
-        for event in latency_events:
-            latency = event.data.get("latency", 0)
+        latency_events = buckets.get(EventType.PERFORMANCE_LATENCY, ())
+        severities = score_capped(arrays.latency, 5000.0)
+        for event, severity in zip(latency_events, severities.tolist()):
+            latency = numeric_field(event.data, "latency", 0)
             operation = event.data.get("operation", "unknown")
-            severity = min(1.0, latency / 5000)
             patterns.append(
                 FrictionPattern(
-                    pattern_type="performance_degradation",
+                    pattern_type=PatternType.PERFORMANCE_DEGRADATION,
                     severity=severity,
                     timestamp=event.timestamp,
-                    description=f"High latency for {operation}: {latency}ms",
-                    event_id=event.eventId,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.HIGH_LATENCY,
+                    template_args=(str(operation), str(latency)),
                 )
             )
 
         return patterns
 
     def _detect_affordance_confusion(
-        self, session: ReconstructedSession
+        self, buckets: EventBuckets, arrays: SessionArrays
     ) -> List[FrictionPattern]:
         """Detect affordance confusion (unclear UI elements)"""
         patterns = []
 
         # Rapid clicks indicate unclear feedback
-        rapid_click_events = session.get_events_by_type(EventType.FRICTION_RAPID_CLICK)
-        for event in rapid_click_events:
-            click_count = event.data.get("clickCount", 0)
+        rapid_click_events = buckets.get(EventType.FRICTION_RAPID_CLICK, ())
+        severities = score_capped(arrays.click_count, 10.0)
+        for event, severity in zip(rapid_click_events, severities.tolist()):
             target = event.data.get("target", "unknown")
-            severity = min(1.0, click_count / 10)
             patterns.append(
                 FrictionPattern(
-                    pattern_type="affordance_confusion",
+                    pattern_type=PatternType.AFFORDANCE_CONFUSION,
                     severity=severity,
                     timestamp=event.timestamp,
-                    description=f"Rapid clicking on '{target}' suggests unclear affordance or missing feedback",
-                    event_id=event.eventId,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.RAPID_CLICK,
+                    template_args=(str(target),),
                 )
             )
 
         # Navigation reversals can indicate confusion
-        reversal_events = session.get_events_by_type(
-            EventType.FRICTION_NAVIGATION_REVERSAL
-        )
-        for event in reversal_events:
-            time_on_page = event.data.get("timeOnPage", 0)
-            if time_on_page < 2000:  # Very quick reversal
-                patterns.append(
-                    FrictionPattern(
-                        pattern_type="affordance_confusion",
-                        severity=0.7,
-                        timestamp=event.timestamp,
-                        description="Quick navigation reversal suggests user didn't find expected content",
-                        event_id=event.eventId,
-                    )
+        reversal_events = buckets.get(EventType.FRICTION_NAVIGATION_REVERSAL, ())
+        for idx in np.flatnonzero(arrays.time_on_page < 2000):  # Very quick reversal
+            event = reversal_events[idx]
+            patterns.append(
+                FrictionPattern(
+                    pattern_type=PatternType.AFFORDANCE_CONFUSION,
+                    severity=0.7,
+                    timestamp=event.timestamp,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.QUICK_REVERSAL,
                 )
+            )
 
         return patterns
 
     def _detect_cognitive_overload(
-        self, session: ReconstructedSession
+        self, buckets: EventBuckets, arrays: SessionArrays
     ) -> List[FrictionPattern]:
         """Detect cognitive overload indicators"""
         patterns = []
 
         # Form abandonment indicates complexity/frustration
-        abandon_events = session.get_events_by_type(
-            EventType.FRICTION_FORM_ABANDONMENT
-        )
-        for event in abandon_events:
-            fields_completed = event.data.get("fieldsCompleted", 0)
-            total_fields = event.data.get("totalFields", 1)
-            completion_rate = fields_completed / total_fields if total_fields > 0 else 0
-
-            severity = 1.0 - completion_rate  # Higher severity for earlier abandonment
+        abandon_events = buckets.get(EventType.FRICTION_FORM_ABANDONMENT, ())
+        # Higher severity for earlier abandonment
+        severities = score_abandonment(arrays.fields_completed, arrays.total_fields)
+        for event, severity in zip(abandon_events, severities.tolist()):
+            completed = numeric_field(event.data, "fieldsCompleted", 0)
+            total = numeric_field(event.data, "totalFields", 1)
             patterns.append(
                 FrictionPattern(
-                    pattern_type="cognitive_overload",
+                    pattern_type=PatternType.COGNITIVE_OVERLOAD,
                     severity=severity,
                     timestamp=event.timestamp,
-                    description=f"Form abandoned after completing {fields_completed}/{total_fields} fields",
-                    event_id=event.eventId,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.FORM_ABANDONED,
+                    template_args=(str(completed), str(total)),
                 )
             )
 
         return patterns
 
-    def _detect_expectation_mismatch(
-        self, session: ReconstructedSession
-    ) -> List[FrictionPattern]:
+    def _detect_expectation_mismatch(self, buckets: EventBuckets) -> List[FrictionPattern]:
         """Detect expectation mismatches"""
         patterns = []
 
         # Errors indicate broken expectations
-        error_events = session.get_events_by_type(EventType.FRICTION_ERROR)
+        error_events = buckets.get(EventType.FRICTION_ERROR, ())
         for event in error_events:
             error_type = event.data.get("errorType", "unknown")
             patterns.append(
                 FrictionPattern(
-                    pattern_type="expectation_mismatch",
+                    pattern_type=PatternType.EXPECTATION_MISMATCH,
                     severity=0.8,
                     timestamp=event.timestamp,
-                    description=f"Error encountered: {error_type}",
-                    event_id=event.eventId,
+                    event_id=event.event_id,
+                    template_id=FrictionTemplate.ERROR,
+                    template_args=(str(error_type),),
                 )
             )
 
         # Multiple navigation reversals suggest confusion
-        reversals = session.get_events_by_type(EventType.FRICTION_NAVIGATION_REVERSAL)
+        reversals = buckets.get(EventType.FRICTION_NAVIGATION_REVERSAL, ())
         if len(reversals) >= 3:
             patterns.append(
                 FrictionPattern(
-                    pattern_type="expectation_mismatch",
+                    pattern_type=PatternType.EXPECTATION_MISMATCH,
                     severity=0.6,
                     timestamp=reversals[-1].timestamp,
-                    description=f"Multiple navigation reversals ({len(reversals)}) suggest unmet expectations",
-                    event_id=reversals[-1].eventId,
+                    event_id=reversals[-1].event_id,
+                    template_id=FrictionTemplate.REPEATED_REVERSALS,
+                    template_args=(str(len(reversals)),),
                 )
             )
 
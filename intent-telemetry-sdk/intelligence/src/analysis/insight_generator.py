@@ -2,63 +2,105 @@
 Insight generation system
 """
 
+import asyncio
+import multiprocessing
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import List
-from src.models.session import IntentHypothesis, FrictionPattern, InsightSummary
+from src.models.session import (
+    FrictionPattern,
+    InsightBuilder,
+    InsightSummary,
+    IntentHypothesis,
+    PatternType,
+    insight_confidence,
+)
 from src.analysis.session_reconstructor import ReconstructedSession
 from src.analysis.friction_classifier import FrictionClassifier
 from src.analysis.intent_inferrer import IntentInferrer
 
+# Intent wording that signals the user was struggling
+_STRUGGLE_RE = re.compile(r"abandon|unable|can't|couldn't|failed", re.IGNORECASE)
+
+# Sessions smaller than this are classified inline; pickling them to a worker costs more
+OFFLOAD_MIN_EVENTS = 500
+
+
+@lru_cache(maxsize=1)
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared worker pool for CPU-bound session classification"""
+    # Spawned workers start clean instead of forking the event loop and its threads
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def shutdown_pool() -> None:
+    """Stop the worker pool if it was started (called on app shutdown)"""
+    if _get_pool.cache_info().currsize:
+        _get_pool().shutdown(wait=True, cancel_futures=True)
+        _get_pool.cache_clear()
+
+
+def _classify_sync(session: ReconstructedSession) -> List[FrictionPattern]:
+    """Classify friction patterns (runs in a worker process for large sessions)"""
+    # Fresh classifier so patterns don't accumulate
+    return FrictionClassifier().analyze_session(session)
+
 
 class InsightGenerator:
     """Generates actionable insights from session analysis"""
 
     def __init__(self, intent_inferrer: IntentInferrer):
         self.intent_inferrer = intent_inferrer
-        self.friction_classifier = FrictionClassifier()
 
     async def generate_insights(self, session: ReconstructedSession) -> InsightSummary:
         """Generate comprehensive insights for a session"""
+        builder = InsightBuilder(session.session_id, session.end_time or session.start_time)
 
-        # 1. Classify friction patterns
-        friction_patterns = self.friction_classifier.analyze_session(session)
+        # 1. Classify friction patterns (off the event loop for large sessions)
+        if len(session.events) >= OFFLOAD_MIN_EVENTS:
+            loop = asyncio.get_running_loop()
+            builder.friction_patterns = await loop.run_in_executor(
+                _get_pool(), _classify_sync, session
+            )
+        else:
+            builder.friction_patterns = _classify_sync(session)
 
         # 2. Infer intent using LLM (skip if no valid API key)
         try:
-            intent_hypotheses = await self.intent_inferrer.infer_intent(
-                session, friction_patterns
+            builder.intent_hypotheses = await self.intent_inferrer.infer_intent(
+                session, builder.friction_patterns
             )
         except (ValueError, Exception) as e:
             # If OpenAI is not available, use basic intent placeholder
             print(f"⚠️  Intent inference skipped: {str(e)}")
-            intent_hypotheses = [
+            builder.intent_hypotheses = [
                 IntentHypothesis(
                     hypothesis="User interacted with the application (AI inference unavailable - OpenAI API key not configured)",
                     confidence=0.5,
-                    supporting_evidence=[
+                    supporting_evidence=(
                         f"Session included {len(session.events)} events",
-                        f"User visited {session.metrics.get('page_views', 0)} pages"
-                    ]
+                        f"User visited {session.get_page_views()} pages",
+                    ),
+                    timestamp=session.end_time or session.start_time,
                 )
             ]
 
         # 3. Generate recommendations
-        recommendations = self._generate_recommendations(
-            session, friction_patterns, intent_hypotheses
+        builder.recommendations = self._generate_recommendations(
+            session, builder.friction_patterns, builder.intent_hypotheses
         )
 
         # 4. Calculate overall confidence score
         confidence_score = self._calculate_confidence(
-            intent_hypotheses, friction_patterns
+            builder.intent_hypotheses, builder.friction_patterns
         )
 
-        return InsightSummary(
-            session_id=session.session_id,
-            timestamp=session.end_time or session.start_time,
-            intent_hypotheses=intent_hypotheses,
-            friction_patterns=friction_patterns,
-            recommendations=recommendations,
-            confidence_score=confidence_score,
-        )
+        return builder.build(confidence_score)
 
     def _generate_recommendations(
         self,
@@ -69,17 +111,17 @@ class InsightGenerator:
         """Generate actionable recommendations"""
         recommendations = []
 
-        # Group friction by type
-        friction_by_type = {}
+        # Aggregate [count, severity sum] per friction type in one pass
+        friction_by_type = defaultdict(lambda: [0, 0.0])
         for pattern in friction_patterns:
-            if pattern.pattern_type not in friction_by_type:
-                friction_by_type[pattern.pattern_type] = []
-            friction_by_type[pattern.pattern_type].append(pattern)
+            agg = friction_by_type[pattern.pattern_type]
+            agg[0] += 1
+            agg[1] += pattern.severity
 
         # Performance recommendations
-        if "performance_degradation" in friction_by_type:
-            patterns = friction_by_type["performance_degradation"]
-            avg_severity = sum(p.severity for p in patterns) / len(patterns)
+        if PatternType.PERFORMANCE_DEGRADATION in friction_by_type:
+            count, severity_sum = friction_by_type[PatternType.PERFORMANCE_DEGRADATION]
+            avg_severity = severity_sum / count
             if avg_severity > 0.7:
                 recommendations.append(
                     "🚀 Critical: Optimize page load performance and reduce interaction latency"
@@ -90,19 +132,19 @@ class InsightGenerator:
                 )
 
         # Affordance confusion recommendations
-        if "affordance_confusion" in friction_by_type:
+        if PatternType.AFFORDANCE_CONFUSION in friction_by_type:
             recommendations.append(
                 "🎯 Improve visual feedback for interactive elements (consider: loading states, hover effects, click acknowledgment)"
             )
 
         # Cognitive overload recommendations
-        if "cognitive_overload" in friction_by_type:
+        if PatternType.COGNITIVE_OVERLOAD in friction_by_type:
             recommendations.append(
                 "🧠 Simplify forms and reduce cognitive load (consider: progressive disclosure, better labels, inline validation)"
             )
 
         # Expectation mismatch recommendations
-        if "expectation_mismatch" in friction_by_type:
+        if PatternType.EXPECTATION_MISMATCH in friction_by_type:
             recommendations.append(
                 "✨ Align UI behavior with user expectations (consider: clearer error messages, better navigation cues)"
             )
@@ -110,7 +152,7 @@ class InsightGenerator:
         # Intent-based recommendations
         for hypothesis in intent_hypotheses:
             if hypothesis.confidence > 0.7:
-                if "abandon" in hypothesis.hypothesis.lower() or "unable" in hypothesis.hypothesis.lower():
+                if _STRUGGLE_RE.search(hypothesis.hypothesis):
                     recommendations.append(
                         f"🎓 User appears to be struggling with: {hypothesis.hypothesis.lower().replace('user ', '')}"
                     )
@@ -133,18 +175,4 @@ class InsightGenerator:
         friction_patterns: List[FrictionPattern],
     ) -> float:
         """Calculate overall confidence score for insights"""
-
-        # Base confidence on intent hypotheses
-        if intent_hypotheses:
-            intent_confidence = max(h.confidence for h in intent_hypotheses)
-        else:
-            intent_confidence = 0.0
-
-        # Adjust based on friction detection certainty
-        # More friction patterns = more certainty in analysis
-        friction_factor = min(1.0, len(friction_patterns) / 10)
-
-        # Weighted average
-        confidence = (intent_confidence * 0.7) + (friction_factor * 0.3)
-
-        return round(confidence, 2)
+        return insight_confidence(intent_hypotheses, len(friction_patterns))
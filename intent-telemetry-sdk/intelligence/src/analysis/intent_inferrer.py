@@ -2,14 +2,23 @@
 Intent inference using LLM
 """
 
+import hashlib
 import json
 import os
+from collections import OrderedDict
 from typing import List, Optional
-from openai import OpenAI
-from src.models.session import IntentHypothesis
+import numpy as np
+from openai import AsyncOpenAI
+from src.models.session import INTENT_HYPOTHESES_ADAPTER, IntentHypothesis
 from src.analysis.session_reconstructor import ReconstructedSession
 from src.analysis.friction_classifier import FrictionPattern
 
+# Max number of sessions whose inferred intents are kept in memory
+INTENT_CACHE_SIZE = 1024
+
+_SEVERITY_BINS = np.array([0.4, 0.7])
+_SEVERITY_LABELS = np.array(["Low", "Medium", "High"])
+
 
 class IntentInferrer:
     """Infers user intent from session events using LLM."""
@@ -19,6 +28,7 @@ class IntentInferrer:
         self._api_key = api_key or os.getenv("OPENAI_API_KEY")
         self._client = None
         self.model = "gpt-4o-mini"  # Cost-effective model
+        self._cache: OrderedDict[str, List[IntentHypothesis]] = OrderedDict()
     
     @property
     def client(self):
@@ -26,7 +36,7 @@ class IntentInferrer:
         if self._client is None:
             if not self._api_key or self._api_key == "sk-dummy-key-for-testing":
                 raise ValueError("Valid OPENAI_API_KEY required for intent inference")
-            self._client = OpenAI(api_key=self._api_key)
+            self._client = AsyncOpenAI(api_key=self._api_key)
         return self._client
 
     async def infer_intent(
@@ -36,6 +46,13 @@ class IntentInferrer:
     ) -> List[IntentHypothesis]:
         """Infer user intent from session events"""
 
+        # Unchanged sessions reuse the previous LLM answer
+        cache_key = self._cache_key(session, friction_patterns)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return list(cached)
+
         # Prepare event sequence summary
         event_summary = self._prepare_event_summary(session)
         friction_summary = self._prepare_friction_summary(friction_patterns)
@@ -74,7 +91,7 @@ Respond in JSON format:
 """
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -90,19 +107,26 @@ Respond in JSON format:
             # Parse response
             result = json.loads(response.choices[0].message.content)
 
-            # Convert to IntentHypothesis objects
-            hypotheses = []
-            for h in result.get("hypotheses", []):
-                hypotheses.append(
-                    IntentHypothesis(
-                        hypothesis=h["intent"],
-                        confidence=h["confidence"],
-                        supporting_evidence=h["evidence"],
-                        timestamp=session.end_time or session.start_time,
-                    )
-                )
+            # Convert to IntentHypothesis objects (model output is untrusted, so
+            # validate the whole list in one pass)
+            timestamp = session.end_time or session.start_time
+            hypotheses = INTENT_HYPOTHESES_ADAPTER.validate_python(
+                [
+                    {
+                        "hypothesis": h["intent"],
+                        "confidence": h["confidence"],
+                        "supporting_evidence": h["evidence"],
+                        "timestamp": timestamp,
+                    }
+                    for h in result.get("hypotheses", [])
+                ],
+            )
+
+            self._cache[cache_key] = hypotheses
+            if len(self._cache) > INTENT_CACHE_SIZE:
+                self._cache.popitem(last=False)
 
-            return hypotheses
+            return list(hypotheses)
 
         except Exception as e:
             print(f"Error inferring intent: {e}")
@@ -111,24 +135,30 @@ Respond in JSON format:
                 IntentHypothesis(
                     hypothesis="Unable to determine intent (analysis error)",
                     confidence=0.0,
-                    supporting_evidence=["Error during analysis"],
+                    supporting_evidence=("Error during analysis",),
                     timestamp=session.end_time or session.start_time,
                 )
             ]
 
+    def _cache_key(
+        self, session: ReconstructedSession, friction_patterns: List[FrictionPattern]
+    ) -> str:
+        """Hash the session state the prompt is built from"""
+        last_sequence = session.events[-1].seq if session.events else -1
+        raw = f"{session.session_id}:{len(session.events)}:{last_sequence}:{len(friction_patterns)}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
     def _prepare_event_summary(self, session: ReconstructedSession) -> str:
         """Prepare human-readable event summary"""
-        sequence = session.get_event_sequence()
-
         # Limit to most important events
         summary_lines = []
-        for i, event in enumerate(sequence[:20]):  # Limit to 20 most recent
+        for i, event in enumerate(session.get_event_sequence(limit=20)):
             event_type = event["type"].replace("_", " ").title()
             page_title = event["context"].get("pageTitle", "Unknown")
             summary_lines.append(f"{i+1}. {event_type} - {page_title}")
 
-        if len(sequence) > 20:
-            summary_lines.append(f"... and {len(sequence) - 20} more events")
+        if len(session.events) > 20:
+            summary_lines.append(f"... and {len(session.events) - 20} more events")
 
         return "\n".join(summary_lines)
 
@@ -137,13 +167,16 @@ Respond in JSON format:
         if not patterns:
             return "No friction detected"
 
+        # Bucket severities into labels: (.., 0.4] Low, (0.4, 0.7] Medium, (0.7, ..) High
+        severities = np.fromiter(
+            (p.severity for p in patterns), dtype=np.float64, count=len(patterns)
+        )
+        labels = _SEVERITY_LABELS[np.digitize(severities, _SEVERITY_BINS, right=True)]
+
         summary_lines = []
-        for i, pattern in enumerate(patterns, 1):
-            severity_label = (
-                "High" if pattern.severity > 0.7 else "Medium" if pattern.severity > 0.4 else "Low"
-            )
+        for i, (pattern, severity_label) in enumerate(zip(patterns, labels.tolist()), 1):
             summary_lines.append(
-                f"{i}. [{severity_label}] {pattern.pattern_type}: {pattern.description}"
+                f"{i}. [{severity_label}] {pattern.pattern_type.value}: {pattern.description}"
             )
 
         return "\n".join(summary_lines)
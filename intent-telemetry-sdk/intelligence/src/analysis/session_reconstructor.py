@@ -2,19 +2,98 @@
 Session reconstruction engine
 """
 
+import bisect
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
-from src.models.event import TelemetryEvent, EventType
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from src.models.event import EventRec, EventType
+from src.analysis.session_store import SessionStore
+
+_EMPTY: List[EventRec] = []
+_SEQUENCE_KEY = attrgetter("seq")
+
+EventBuckets = Dict[EventType, List[EventRec]]
+
+_INTERACTION_TYPES = frozenset(
+    {
+        EventType.ACTION_CLICK,
+        EventType.ACTION_SUBMIT,
+        EventType.ACTION_INPUT,
+    }
+)
+_FRICTION_TYPES = frozenset(
+    {
+        EventType.FRICTION_RAPID_CLICK,
+        EventType.FRICTION_NAVIGATION_REVERSAL,
+        EventType.FRICTION_ERROR,
+        EventType.FRICTION_FORM_ABANDONMENT,
+    }
+)
+
+
+def numeric_field(data: Dict[str, Any], key: str, default: int) -> Union[int, float]:
+    """Numeric value of a client data field (default if missing or not a finite number)"""
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return default
+    # Also rejects NaN, infinities and ints too large for a float64
+    return value if -1e300 < value < 1e300 else default
+
+
+def _column(events: List[EventRec], key: str, default: int) -> np.ndarray:
+    """Extract one numeric data field from a list of events"""
+    return np.fromiter(
+        (numeric_field(e.data, key, default) for e in events),
+        dtype=np.float64,
+        count=len(events),
+    )
+
+
+@dataclass
+class SessionArrays:
+    """Numeric event fields as columns, row-aligned with the matching type bucket"""
+
+    load_time: np.ndarray  # PERFORMANCE_LOAD
+    latency: np.ndarray  # PERFORMANCE_LATENCY
+    click_count: np.ndarray  # FRICTION_RAPID_CLICK
+    time_on_page: np.ndarray  # FRICTION_NAVIGATION_REVERSAL
+    fields_completed: np.ndarray  # FRICTION_FORM_ABANDONMENT
+    total_fields: np.ndarray  # FRICTION_FORM_ABANDONMENT
+
+    @classmethod
+    def from_buckets(cls, by_type: EventBuckets) -> "SessionArrays":
+        """Build columns from events already bucketed by type"""
+        abandons = by_type.get(EventType.FRICTION_FORM_ABANDONMENT, _EMPTY)
+        return cls(
+            load_time=_column(by_type.get(EventType.PERFORMANCE_LOAD, _EMPTY), "loadTime", 0),
+            latency=_column(by_type.get(EventType.PERFORMANCE_LATENCY, _EMPTY), "latency", 0),
+            click_count=_column(
+                by_type.get(EventType.FRICTION_RAPID_CLICK, _EMPTY), "clickCount", 0
+            ),
+            time_on_page=_column(
+                by_type.get(EventType.FRICTION_NAVIGATION_REVERSAL, _EMPTY), "timeOnPage", 0
+            ),
+            fields_completed=_column(abandons, "fieldsCompleted", 0),
+            total_fields=_column(abandons, "totalFields", 1),
+        )
 
 
 class ReconstructedSession:
     """Reconstructed session from events"""
 
-    def __init__(self, session_id: str, events: List[TelemetryEvent]):
+    def __init__(self, session_id: str, events: List[EventRec], presorted: bool = False):
         self.session_id = session_id
-        self.events = sorted(events, key=lambda e: e.sequenceNumber)
-        self.start_time = events[0].timestamp if events else datetime.now()
-        self.end_time = events[-1].timestamp if events else None
+        self.events = list(events) if presorted else sorted(events, key=_SEQUENCE_KEY)
+        self.start_time = self.events[0].timestamp if events else datetime.now()
+        self.end_time = self.events[-1].timestamp if events else None
+
+        # Bucket events by type once so type queries are dict lookups
+        self._by_type: EventBuckets = {}
+        for e in self.events:
+            self._by_type.setdefault(e.type, []).append(e)
 
     def get_duration_ms(self) -> int:
         """Get session duration in milliseconds"""
@@ -22,74 +101,88 @@ class ReconstructedSession:
             return 0
         return int((self.end_time - self.start_time).total_seconds() * 1000)
 
-    def get_events_by_type(self, event_type: EventType) -> List[TelemetryEvent]:
+    def get_type_buckets(self) -> EventBuckets:
+        """Get all events grouped by type (shared, do not mutate)"""
+        return self._by_type
+
+    def get_events_by_type(self, event_type: EventType) -> List[EventRec]:
         """Get events of specific type"""
-        return [e for e in self.events if e.type == event_type]
+        return self._by_type.get(event_type, _EMPTY)
 
     def get_page_views(self) -> int:
         """Count page views/transitions"""
-        return len(self.get_events_by_type(EventType.VIEW_TRANSITION))
+        return len(self._by_type.get(EventType.VIEW_TRANSITION, ()))
 
     def get_interactions(self) -> int:
         """Count user interactions"""
-        interaction_types = [
-            EventType.ACTION_CLICK,
-            EventType.ACTION_SUBMIT,
-            EventType.ACTION_INPUT,
-        ]
-        return sum(len(self.get_events_by_type(t)) for t in interaction_types)
-
-    def get_friction_events(self) -> List[TelemetryEvent]:
-        """Get all friction events"""
-        friction_types = [
-            EventType.FRICTION_RAPID_CLICK,
-            EventType.FRICTION_NAVIGATION_REVERSAL,
-            EventType.FRICTION_ERROR,
-            EventType.FRICTION_FORM_ABANDONMENT,
-        ]
-        return [e for e in self.events if e.type in friction_types]
-
-    def get_event_sequence(self) -> List[Dict]:
-        """Get simplified event sequence for analysis"""
-        return [
-            {
+        return sum(len(self._by_type.get(t, ())) for t in _INTERACTION_TYPES)
+
+    def get_friction_events(self) -> List[EventRec]:
+        """Get all friction events, in sequence order"""
+        return sorted(
+            chain.from_iterable(self._by_type.get(t, ()) for t in _FRICTION_TYPES),
+            key=_SEQUENCE_KEY,
+        )
+
+    def get_event_sequence(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Lazily yield a simplified event sequence for analysis"""
+        for event in islice(self.events, limit):
+            yield {
                 "type": event.type.value,
                 "timestamp": event.timestamp.isoformat(),
-                "sequence": event.sequenceNumber,
+                "sequence": event.seq,
                 "data": event.data,
                 "context": {
-                    "url": event.context.url,
-                    "pageTitle": event.context.pageTitle,
+                    "url": event.url,
+                    "pageTitle": event.page_title,
                 },
             }
-            for event in self.events
-        ]
 
 
 class SessionReconstructor:
     """Reconstructs sessions from event streams"""
 
-    def __init__(self):
-        self.sessions: Dict[str, List[TelemetryEvent]] = {}
+    def __init__(self, max_hot_sessions: int = 10_000, spill_path: Optional[str] = None):
+        # Per-session events, kept sorted by sequence number as they arrive.
+        # Only the most recently used sessions are held in memory.
+        self.sessions = SessionStore(max_hot_sessions, spill_path, on_evict=self._forget_session)
+        self._session_cache: Dict[str, Tuple[int, ReconstructedSession]] = {}
+
+    def _forget_session(self, session_id: str):
+        """Drop the cached reconstruction of a session spilled out of memory"""
+        self._session_cache.pop(session_id, None)
 
-    def add_events(self, events: List[TelemetryEvent]):
+    def add_events(self, events: List[EventRec]):
         """Add events and group by session"""
         for event in events:
-            if event.sessionId not in self.sessions:
-                self.sessions[event.sessionId] = []
-            self.sessions[event.sessionId].append(event)
+            session_events = self.sessions.get(event.session_id)
+            if session_events is None:
+                session_events = []
+                self.sessions[event.session_id] = session_events
+            bisect.insort(session_events, event, key=_SEQUENCE_KEY)
 
     def get_session(self, session_id: str) -> ReconstructedSession:
         """Get reconstructed session"""
-        events = self.sessions.get(session_id, [])
-        return ReconstructedSession(session_id, events)
-
-    def get_all_sessions(self) -> List[ReconstructedSession]:
-        """Get all reconstructed sessions"""
-        return [
-            ReconstructedSession(sid, events) for sid, events in self.sessions.items()
-        ]
+        # Read-only access: spilled sessions are not promoted back into memory
+        events = self.sessions.peek(session_id, _EMPTY)
+        cached = self._session_cache.get(session_id)
+        if cached is not None and cached[0] == len(events):
+            return cached[1]
+
+        session = ReconstructedSession(session_id, events, presorted=True)
+        # Only in-memory sessions are cached, so spilled ones stay out of memory
+        if events and self.sessions.is_hot(session_id):
+            self._session_cache[session_id] = (len(events), session)
+        return session
+
+    def get_all_sessions(self, limit: Optional[int] = None) -> List[ReconstructedSession]:
+        """Get reconstructed sessions (the first limit of them, if given)"""
+        return [self.get_session(sid) for sid in islice(self.sessions, limit)]
 
     def get_session_count(self) -> int:
         """Get total session count"""
         return len(self.sessions)
+
+    def close(self):
+        """Release the session store's spill file"""
+        self.sessions.close()
@@ -0,0 +1,165 @@
+"""
+Bounded session event storage
+"""
+
+import mmap
+import tempfile
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import msgspec
+from cachetools import LRUCache
+from src.models.event import EventRec
+
+_ENCODER = msgspec.msgpack.Encoder()
+_DECODER = msgspec.msgpack.Decoder(List[EventRec])
+
+# msgpack integers are 64-bit; client JSON can carry larger ones
+_MSGPACK_INT_RANGE = range(-(2**63), 2**64)
+
+
+def _fit_ints(value: Any) -> Any:
+    """value with integers msgpack can't hold replaced by floats (strings past float range)"""
+    if isinstance(value, dict):
+        return {k: _fit_ints(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fit_ints(v) for v in value]
+    if isinstance(value, int) and value not in _MSGPACK_INT_RANGE:
+        try:
+            return float(value)
+        except OverflowError:
+            return str(value)
+    return value
+
+
+def _encode(events: List[EventRec]) -> bytes:
+    """msgpack-encode a session, normalizing out-of-range integers in event data"""
+    try:
+        return _ENCODER.encode(events)
+    except OverflowError:
+        return _ENCODER.encode([replace(e, data=_fit_ints(e.data)) for e in events])
+
+
+class _EvictingLRU(LRUCache):
+    """LRU cache that hands evicted entries to a callback"""
+
+    def __init__(self, maxsize: int, on_evict: Callable[[str, List[EventRec]], None]):
+        super().__init__(maxsize=maxsize)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        try:
+            self._on_evict(key, value)
+        except BaseException:
+            # The callback failed to store the entry elsewhere; keep it here
+            # (the slot just freed still fits it) rather than lose it
+            super().__setitem__(key, value)
+            raise
+        return key, value
+
+
+class SessionStore:
+    """
+    Session id -> event list mapping with a bounded in-memory working set
+
+    The most recently used sessions stay in memory. Colder sessions are
+    msgpack-encoded and appended to a spill file. get() reads them back
+    through an mmap and promotes them into memory (for writers); peek() only
+    decodes them. close() releases the spill file.
+    """
+
+    def __init__(
+        self,
+        max_hot_sessions: int = 10_000,
+        spill_path: Optional[str] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self._hot = _EvictingLRU(max_hot_sessions, self._spill)
+        # Cold sessions: session id -> (offset, length) in the spill file.
+        # The file is append-only; records of sessions read back are not reclaimed.
+        self._cold: Dict[str, Tuple[int, int]] = {}
+        # Held open for the store's lifetime and released by close()
+        if spill_path:
+            self._file = open(spill_path, "w+b")  # noqa: SIM115
+        else:
+            self._file = tempfile.TemporaryFile()  # noqa: SIM115
+        self._size = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._on_evict = on_evict
+
+    def _spill(self, session_id: str, events: List[EventRec]):
+        """Append an evicted session to the spill file"""
+        record = _encode(events)
+        self._file.seek(self._size)
+        self._file.write(record)
+        self._file.flush()
+        self._cold[session_id] = (self._size, len(record))
+        self._size += len(record)
+        if self._on_evict is not None:
+            self._on_evict(session_id)
+
+    def _load(self, session_id: str) -> List[EventRec]:
+        """Read a cold session from the spill file (it stays cold)"""
+        offset, length = self._cold[session_id]
+        if self._mmap is None or len(self._mmap) < offset + length:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return _DECODER.decode(self._mmap[offset : offset + length])
+
+    def get(self, session_id: str, default=None) -> Optional[List[EventRec]]:
+        """Get a session's events, promoting it back into memory if spilled"""
+        events = self._hot.get(session_id)
+        if events is not None:
+            return events
+        if session_id not in self._cold:
+            return default
+        events = self._load(session_id)
+        del self._cold[session_id]
+        self._hot[session_id] = events
+        return events
+
+    def peek(self, session_id: str, default=None) -> Optional[List[EventRec]]:
+        """
+        Get a session's events for reading only
+
+        Spilled sessions are decoded from the spill file but not promoted, so
+        reads never evict (and re-spill) other sessions.
+        """
+        events = self._hot.get(session_id)
+        if events is not None:
+            return events
+        if session_id not in self._cold:
+            return default
+        return self._load(session_id)
+
+    def close(self):
+        """Unmap and close the spill file; spilled sessions are unreadable afterwards"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def is_hot(self, session_id: str) -> bool:
+        """Whether a session is currently held in memory"""
+        return session_id in self._hot
+
+    def __getitem__(self, session_id: str) -> List[EventRec]:
+        events = self.get(session_id)
+        if events is None:
+            raise KeyError(session_id)
+        return events
+
+    def __setitem__(self, session_id: str, events: List[EventRec]):
+        self._cold.pop(session_id, None)
+        self._hot[session_id] = events
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._hot or session_id in self._cold
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._hot)
+        yield from list(self._cold)
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
@@ -0,0 +1,43 @@
+"""
+Numeric severity kernels for friction detection
+
+Kernels are JIT-compiled with numba when it is installed (``pip install
+.[jit]``) and run as plain numpy otherwise. Both paths produce identical
+float64 results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+
+        def wrap(func):
+            return func
+
+        return wrap
+
+
+@njit(cache=True)
+def score_above(values: np.ndarray, threshold: float, scale: float):
+    """Mask of values above threshold, and their severities capped at 1.0"""
+    return values > threshold, np.minimum(1.0, values / scale)
+
+
+@njit(cache=True)
+def score_capped(values: np.ndarray, scale: float) -> np.ndarray:
+    """Severities scaled by scale and capped at 1.0"""
+    return np.minimum(1.0, values / scale)
+
+
+@njit(cache=True)
+def score_abandonment(fields_completed: np.ndarray, total_fields: np.ndarray) -> np.ndarray:
+    """Severities for form abandonment: higher for earlier abandonment"""
+    has_fields = total_fields > 0
+    completion_rates = np.where(
+        has_fields, fields_completed / np.where(has_fields, total_fields, 1.0), 0.0
+    )
+    return 1.0 - completion_rates
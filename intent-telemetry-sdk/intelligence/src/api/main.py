@@ -2,15 +2,27 @@
 FastAPI application
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import events, insights
+from src.analysis.insight_generator import shutdown_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the classification worker pool and session spill file when the app stops"""
+    yield
+    shutdown_pool()
+    events.session_reconstructor.close()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Intent Intelligence API",
     description="AI-driven intelligence layer for intent-aware user telemetry",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -27,6 +39,19 @@ app.include_router(events.router)
 app.include_router(insights.router)
 
 
+def openapi() -> dict:
+    """OpenAPI schema, plus the msgspec event models FastAPI doesn't know about"""
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(
+            events.EVENT_SCHEMA_COMPONENTS
+        )
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -2,27 +2,67 @@
 FastAPI routes for event ingestion
 """
 
+import os
 from typing import List
-from fastapi import APIRouter, HTTPException
-from src.models.event import EventBatch, TelemetryEvent
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+import msgspec
+from src.models.event import EventBatch, EventRec, TelemetryEvent
 from src.analysis.session_reconstructor import SessionReconstructor
 
 router = APIRouter(prefix="/api/v1/events", tags=["events"])
 
 # Global session reconstructor (in production, use proper state management/database)
-session_reconstructor = SessionReconstructor()
+session_reconstructor = SessionReconstructor(
+    max_hot_sessions=int(os.getenv("SESSION_CACHE_SIZE", "10000")),
+    spill_path=os.getenv("SESSION_SPILL_PATH"),
+)
 
+# Built once; decodes and validates raw request bytes in a single C pass
+_BATCH_DECODER = msgspec.json.Decoder(EventBatch)
 
-@router.post("/batch")
-async def ingest_batch(batch: EventBatch):
+# The body is read as raw bytes, so FastAPI can't see its model; document it from
+# the msgspec schema instead (main.py adds these components to the OpenAPI schema)
+(_BATCH_SCHEMA,), EVENT_SCHEMA_COMPONENTS = msgspec.json.schema_components(
+    (EventBatch,), ref_template="#/components/schemas/{name}"
+)
+
+
+@router.post(
+    "/batch",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _BATCH_SCHEMA}},
+            "required": True,
+        },
+        "responses": {
+            "422": {
+                "description": "Validation Error",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/HTTPValidationError"}
+                    }
+                },
+            }
+        },
+    },
+)
+async def ingest_batch(request: Request):
     """
     Ingest a batch of telemetry events
 
     This endpoint receives batched events from the SDK and stores them for analysis.
     """
     try:
-        # Validate and add events to reconstructor
-        session_reconstructor.add_events(batch.events)
+        batch = _BATCH_DECODER.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+        )
+
+    try:
+        # Store compact records; the full event tree is dropped after this
+        session_reconstructor.add_events([EventRec.from_event(e) for e in batch.events])
 
         return {
             "status": "success",
@@ -2,9 +2,11 @@
 FastAPI routes for insights
 """
 
+import asyncio
+from functools import lru_cache
 from typing import Optional
-from fastapi import APIRouter, HTTPException
-from src.models.session import InsightSummary
+from fastapi import APIRouter, Depends, HTTPException, Response
+from src.models.session import INSIGHT_SUMMARY_ADAPTER, InsightSummary
 from src.analysis.session_reconstructor import SessionReconstructor
 from src.analysis.intent_inferrer import IntentInferrer
 from src.analysis.insight_generator import InsightGenerator
@@ -12,13 +14,25 @@ from src.api.routes.events import session_reconstructor
 
 router = APIRouter(prefix="/api/v1/insights", tags=["insights"])
 
-# Initialize analysis components
-intent_inferrer = IntentInferrer()
-insight_generator = InsightGenerator(intent_inferrer)
+# Prebuilt serializer; returning its bytes skips FastAPI's response_model round-trip
+_INSIGHT_TO_JSON = INSIGHT_SUMMARY_ADAPTER.dump_json
+
+
+@lru_cache(maxsize=1)
+def get_inferrer() -> IntentInferrer:
+    """Shared intent inferrer (holds the LLM client and intent cache)"""
+    return IntentInferrer()
+
+
+def get_generator() -> InsightGenerator:
+    """Per-request insight generator"""
+    return InsightGenerator(get_inferrer())
 
 
 @router.get("/{session_id}", response_model=InsightSummary)
-async def get_session_insights(session_id: str):
+async def get_session_insights(
+    session_id: str, insight_generator: InsightGenerator = Depends(get_generator)
+):
     """
     Get AI-generated insights for a specific session
 
@@ -37,7 +51,7 @@ async def get_session_insights(session_id: str):
         # Generate insights
         insights = await insight_generator.generate_insights(session)
 
-        return insights
+        return Response(content=_INSIGHT_TO_JSON(insights), media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -47,49 +61,57 @@ async def get_session_insights(session_id: str):
 
 
 @router.get("/summary/all")
-async def get_all_insights_summary():
+async def get_all_insights_summary(
+    insight_generator: InsightGenerator = Depends(get_generator),
+):
     """
     Get summary of insights across all sessions
 
     Returns aggregated insights and statistics across all tracked sessions.
     """
     try:
-        all_sessions = session_reconstructor.get_all_sessions()
+        total_sessions = session_reconstructor.get_session_count()
 
-        if not all_sessions:
+        if not total_sessions:
             return {
                 "total_sessions": 0,
                 "sessions": [],
             }
 
-        # Generate insights for each session (limited to avoid overwhelming)
+        # Generate insights for each session concurrently (limited to avoid overwhelming).
+        # Only the sessions analyzed here are reconstructed.
+        sessions = session_reconstructor.get_all_sessions(limit=10)
+        results = await asyncio.gather(
+            *(insight_generator.generate_insights(session) for session in sessions),
+            return_exceptions=True,
+        )
+
         session_summaries = []
-        for session in all_sessions[:10]:  # Limit to 10 most recent
-            try:
-                insights = await insight_generator.generate_insights(session)
-                session_summaries.append(
-                    {
-                        "session_id": session.session_id,
-                        "duration_ms": session.get_duration_ms(),
-                        "events": len(session.events),
-                        "friction_count": len(insights.friction_patterns),
-                        "primary_intent": (
-                            insights.intent_hypotheses[0].hypothesis
-                            if insights.intent_hypotheses
-                            else "Unknown"
-                        ),
-                        "confidence": insights.confidence_score,
-                        "top_recommendation": (
-                            insights.recommendations[0] if insights.recommendations else None
-                        ),
-                    }
-                )
-            except Exception as e:
-                print(f"Failed to analyze session {session.session_id}: {e}")
+        for session, insights in zip(sessions, results):
+            # BaseException: a cancelled pool future comes back as CancelledError
+            if isinstance(insights, BaseException):
+                print(f"Failed to analyze session {session.session_id}: {insights}")
                 continue
+            session_summaries.append(
+                {
+                    "session_id": session.session_id,
+                    "duration_ms": session.get_duration_ms(),
+                    "events": len(session.events),
+                    "friction_count": len(insights.friction_patterns),
+                    "primary_intent": (
+                        insights.intent_hypotheses[0].hypothesis
+                        if insights.intent_hypotheses
+                        else "Unknown"
+                    ),
+                    "confidence": insights.confidence_score,
+                    "top_recommendation": (
+                        insights.recommendations[0] if insights.recommendations else None
+                    ),
+                }
+            )
 
         return {
-            "total_sessions": len(all_sessions),
+            "total_sessions": total_sessions,
             "analyzed_sessions": len(session_summaries),
             "sessions": session_summaries,
         }
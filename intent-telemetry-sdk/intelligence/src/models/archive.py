@@ -0,0 +1,97 @@
+"""
+Parquet archival of insight summaries
+
+Requires pyarrow (``pip install .[archive]``); import lazily through
+InsightSummary.write_parquet.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.models.session import FrictionPattern, InsightSummary, IntentHypothesis
+
+ARCHIVE_CHUNK_ROWS = 65_536
+
+_TIMESTAMP = pa.timestamp("ns", tz="UTC")
+
+_HYPOTHESIS = pa.struct(
+    [
+        ("hypothesis", pa.string()),
+        ("confidence", pa.float32()),
+        ("supporting_evidence", pa.list_(pa.string())),
+        ("timestamp", _TIMESTAMP),
+    ]
+)
+
+_PATTERN = pa.struct(
+    [
+        ("pattern_type", pa.string()),
+        ("severity", pa.float32()),
+        ("timestamp", _TIMESTAMP),
+        ("description", pa.string()),
+        ("event_id", pa.string()),
+    ]
+)
+
+INSIGHT_SCHEMA = pa.schema(
+    [
+        ("session_id", pa.string()),
+        ("timestamp", _TIMESTAMP),
+        ("intent_hypotheses", pa.list_(_HYPOTHESIS)),
+        ("friction_patterns", pa.list_(_PATTERN)),
+        ("recommendations", pa.list_(pa.string())),
+        ("confidence_score", pa.float32()),
+    ]
+)
+
+
+def _hypothesis_row(h: IntentHypothesis) -> dict:
+    return {
+        "hypothesis": h.hypothesis,
+        "confidence": h.confidence,
+        "supporting_evidence": list(h.supporting_evidence),
+        "timestamp": h.timestamp,
+    }
+
+
+def _pattern_row(p: FrictionPattern) -> dict:
+    return {
+        "pattern_type": p.pattern_type.value,
+        "severity": p.severity,
+        "timestamp": p.timestamp,
+        "description": p.description,
+        "event_id": p.event_id,
+    }
+
+
+def _to_record_batch(rows: List[InsightSummary]) -> pa.RecordBatch:
+    """Convert one chunk of insights into a record batch, column by column"""
+    columns = [
+        [r.session_id for r in rows],
+        [r.timestamp for r in rows],
+        [[_hypothesis_row(h) for h in r.intent_hypotheses] for r in rows],
+        [[_pattern_row(p) for p in r.friction_patterns] for r in rows],
+        [list(r.recommendations) for r in rows],
+        [r.confidence_score for r in rows],
+    ]
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, INSIGHT_SCHEMA)]
+    return pa.RecordBatch.from_arrays(arrays, schema=INSIGHT_SCHEMA)
+
+
+def _chunks(insights: Iterable[InsightSummary], size: int) -> Iterator[List[InsightSummary]]:
+    it = iter(insights)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def write_insights_parquet(
+    insights: Iterable[InsightSummary], path: str, chunk_rows: int = ARCHIVE_CHUNK_ROWS
+) -> int:
+    """Write insights to a single Parquet file and return the number of rows written"""
+    rows = 0
+    with pq.ParquetWriter(path, INSIGHT_SCHEMA, compression="zstd", use_dictionary=True) as writer:
+        for chunk in _chunks(insights, chunk_rows):
+            writer.write_batch(_to_record_batch(chunk))
+            rows += len(chunk)
+    return rows
@@ -1,11 +1,12 @@
 """
-Pydantic models for events
+Event models (msgspec structs, decoded straight from request bytes)
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+import msgspec
 
 
 class EventType(str, Enum):
@@ -30,21 +31,21 @@ class EventType(str, Enum):
     FRICTION_FORM_ABANDONMENT = "friction.form_abandonment"
 
 
-class DeviceInfo(BaseModel):
+class DeviceInfo(msgspec.Struct):
     """Device information"""
 
     type: str
     touchEnabled: bool
 
 
-class Viewport(BaseModel):
+class Viewport(msgspec.Struct):
     """Viewport dimensions"""
 
     width: int
     height: int
 
 
-class EventContext(BaseModel):
+class EventContext(msgspec.Struct, kw_only=True):
     """Event context"""
 
     url: Optional[str] = None
@@ -54,7 +55,7 @@ class EventContext(BaseModel):
     userAgent: Optional[str] = None
 
 
-class TelemetryEvent(BaseModel):
+class TelemetryEvent(msgspec.Struct):
     """Base telemetry event"""
 
     schemaVersion: str
@@ -66,14 +67,49 @@ class TelemetryEvent(BaseModel):
     context: EventContext
     data: Dict[str, Any]
 
-    class Config:
-        use_enum_values = True
 
-
-class EventBatch(BaseModel):
+class EventBatch(msgspec.Struct):
     """Batch of events sent from client"""
 
     schemaVersion: str
     batchId: str
     timestamp: datetime
     events: list[TelemetryEvent]
+
+
+@dataclass(slots=True)
+class EventRec:
+    """Compact in-memory form of a validated TelemetryEvent"""
+
+    type: EventType
+    event_id: str
+    session_id: str
+    ts: float  # Epoch seconds
+    seq: int
+    url: Optional[str]
+    page_title: Optional[str]
+    data: Dict[str, Any]
+
+    @classmethod
+    def from_event(cls, event: TelemetryEvent) -> "EventRec":
+        """Flatten a decoded event, keeping only the fields analysis reads"""
+        timestamp = event.timestamp
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        # Positional, in field order: this runs once per ingested event
+        context = event.context
+        return cls(
+            event.type,
+            event.eventId,
+            event.sessionId,
+            timestamp.timestamp(),
+            event.sequenceNumber,
+            context.url,
+            context.pageTitle,
+            event.data,
+        )
+
+    @property
+    def timestamp(self) -> datetime:
+        """Event time as an aware UTC datetime"""
+        return datetime.fromtimestamp(self.ts, tz=timezone.utc)
@@ -1,50 +1,522 @@
 """
 Session models
+
+Plain slotted dataclasses: internal producers construct them directly, and
+untrusted input (e.g. LLM output) is validated through a cached pydantic
+TypeAdapter at the boundary only.
 """
 
-from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum, IntEnum
+from functools import cache
+from typing import Annotated, Any, Final, Iterable, Iterator, Optional, Sequence, TypeVar
+import msgspec
+import numpy as np
+from pydantic import (
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    computed_field,
+    model_validator,
+)
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # ciso8601 is optional
+    parse_datetime = None
+
+T = TypeVar("T")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Boundary validator settings (read by TypeAdapter via __pydantic_config__).
+# Schemas are built on first validation rather than at import, and unknown
+# keys in external payloads are dropped without being validated.
+_MODEL_CONFIG = ConfigDict(
+    frozen=True,
+    defer_build=True,
+    extra="ignore",
+    validate_default=False,
+    populate_by_name=False,
+    str_strip_whitespace=False,
+    arbitrary_types_allowed=False,
+    validate_assignment=False,
+)
+
+
+def _parse_iso(value: Any) -> Any:
+    """Parse ISO-8601 strings with ciso8601 if installed; other values pass through"""
+    if parse_datetime is None or not isinstance(value, str):
+        return value
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        # Not ISO-8601 (e.g. "1700000000"): leave it to pydantic's own parser
+        return value
+
+
+# Datetime field type: ISO strings are parsed by ciso8601 when installed
+# (``pip install .[dates]``), otherwise by pydantic's own parser
+Ts = Annotated[datetime, BeforeValidator(_parse_iso)]
+
+
+# SessionSummary wire layout, fields in declaration order (little-endian):
+# start_ns i64, end_ns i64 (-1 if open), four u32 counters, then the UTF-8 session id
+_SUMMARY_CODES = "qqIIII"
+_SUMMARY_HEADER = struct.Struct("<" + _SUMMARY_CODES)
+# (format, offset) per header field; "<" packs without padding, so each offset
+# is the size of the fields before it
+_SUMMARY_FIELDS = tuple(
+    (struct.Struct("<" + code), struct.calcsize("<" + _SUMMARY_CODES[:i]))
+    for i, code in enumerate(_SUMMARY_CODES)
+)
+
+
+def _from_ns(ns: int) -> datetime:
+    """Epoch nanoseconds to an aware UTC datetime (microsecond precision)"""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
 
 
-class SessionSummary(BaseModel):
-    """Session summary"""
+@dataclass(slots=True, frozen=True)
+class SessionSummary:
+    """Session summary (times are UTC epoch nanoseconds)"""
+
+    __pydantic_config__ = _MODEL_CONFIG
 
     session_id: str
-    start_time: datetime
-    end_time: Optional[datetime] = None
-    duration_ms: Optional[int] = None
+    start_ns: int
     event_count: int
     page_views: int
     interactions: int
     friction_events: int
+    end_ns: Optional[int] = None
+
+    @property
+    def duration_ms(self) -> Optional[int]:
+        """Session duration in milliseconds, if the session has ended"""
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) // 1_000_000
+
+    @property
+    def start_time(self) -> datetime:
+        """Session start as an aware UTC datetime"""
+        return _from_ns(self.start_ns)
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        """Session end as an aware UTC datetime, if the session has ended"""
+        return None if self.end_ns is None else _from_ns(self.end_ns)
+
+    def to_bytes(self) -> bytes:
+        """Encode into the fixed positional layout read by SessionSummaryView"""
+        end_ns = -1 if self.end_ns is None else self.end_ns
+        header = _SUMMARY_HEADER.pack(
+            self.start_ns,
+            end_ns,
+            self.event_count,
+            self.page_views,
+            self.interactions,
+            self.friction_events,
+        )
+        return header + self.session_id.encode()
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> "SessionSummary":
+        """Decode every field of an encoded summary"""
+        return SessionSummaryView(buf).materialize()
+
+    def to_msg(self) -> "SessionSummaryMsg":
+        """Copy into the msgspec struct used for egress"""
+        return SessionSummaryMsg(
+            self.session_id,
+            self.start_ns,
+            self.event_count,
+            self.page_views,
+            self.interactions,
+            self.friction_events,
+            self.end_ns,
+        )
+
+
+class SessionSummaryMsg(msgspec.Struct, array_like=True, frozen=True):
+    """SessionSummary egress struct, encoded positionally as an array"""
+
+    session_id: str
+    start_ns: int
+    event_count: int
+    page_views: int
+    interactions: int
+    friction_events: int
+    end_ns: Optional[int] = None
+
+
+_SUMMARY_ENCODER = msgspec.json.Encoder()
+_SUMMARY_DECODER = msgspec.json.Decoder(list[SessionSummaryMsg])
+
+
+def encode_summaries(summaries: Iterable[SessionSummary]) -> bytes:
+    """Encode summaries as a JSON array of positional records"""
+    return _SUMMARY_ENCODER.encode([s.to_msg() for s in summaries])
+
+
+def decode_summaries(buf: bytes) -> list[SessionSummaryMsg]:
+    """Decode the output of encode_summaries"""
+    return _SUMMARY_DECODER.decode(buf)
+
+
+class SessionSummaryView:
+    """
+    Read-only view over an encoded SessionSummary
+
+    Fields are read in place from the buffer on access, so consumers that
+    only need one or two fields never decode the rest.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, buf: bytes):
+        self._buf = memoryview(buf)
+
+    def _field(self, index: int) -> int:
+        fmt, offset = _SUMMARY_FIELDS[index]
+        return fmt.unpack_from(self._buf, offset)[0]
+
+    @property
+    def session_id(self) -> str:
+        return str(self._buf[_SUMMARY_HEADER.size :], "utf-8")
+
+    @property
+    def start_ns(self) -> int:
+        return self._field(0)
+
+    @property
+    def end_ns(self) -> Optional[int]:
+        end_ns = self._field(1)
+        return None if end_ns < 0 else end_ns
+
+    @property
+    def event_count(self) -> int:
+        return self._field(2)
+
+    @property
+    def page_views(self) -> int:
+        return self._field(3)
+
+    @property
+    def interactions(self) -> int:
+        return self._field(4)
+
+    @property
+    def friction_events(self) -> int:
+        return self._field(5)
+
+    @property
+    def duration_ms(self) -> Optional[int]:
+        end_ns = self.end_ns
+        return None if end_ns is None else (end_ns - self.start_ns) // 1_000_000
+
+    def materialize(self) -> SessionSummary:
+        """Decode all fields into a SessionSummary"""
+        start_ns, end_ns, *counts = _SUMMARY_HEADER.unpack_from(self._buf)
+        return SessionSummary(self.session_id, start_ns, *counts, None if end_ns < 0 else end_ns)
+
+
+# Column widths for SessionSummaryBatch: per-session counters fit in uint32,
+# half the bytes of the default int64 scanned by batch aggregates
+SUMMARY_DTYPE = np.dtype(
+    [
+        ("start_ns", "<i8"),
+        ("duration_ms", "<i8"),
+        ("event_count", "<u4"),
+        ("page_views", "<u4"),
+        ("interactions", "<u4"),
+        ("friction_events", "<u4"),
+    ]
+)
 
+_RING_DTYPE = np.dtype([("session_id", object)] + SUMMARY_DTYPE.descr)
 
-class FrictionPattern(BaseModel):
-    """Detected friction pattern"""
 
-    pattern_type: str
+@dataclass(slots=True, frozen=True)
+class SessionSummaryBatch:
+    """
+    Columnar view over many session summaries for vectorized aggregates
+
+    Row i of every array belongs to session_ids[i]. Column dtypes follow
+    SUMMARY_DTYPE. Sessions that have not ended have duration_ms -1.
+    """
+
+    session_ids: tuple[str, ...]
+    start_ns: np.ndarray  # int64
+    duration_ms: np.ndarray  # int64
+    event_count: np.ndarray  # uint32
+    page_views: np.ndarray  # uint32
+    interactions: np.ndarray  # uint32
+    friction_events: np.ndarray  # uint32
+
+    @classmethod
+    def from_iter(cls, summaries: Iterable[SessionSummary]) -> "SessionSummaryBatch":
+        """Pack summaries into preallocated columns"""
+        rows = tuple(summaries)
+        n = len(rows)
+
+        def column(name: str, values: Iterable[int]) -> np.ndarray:
+            return np.fromiter(values, dtype=SUMMARY_DTYPE[name], count=n)
+
+        return cls(
+            session_ids=tuple(r.session_id for r in rows),
+            start_ns=column("start_ns", (r.start_ns for r in rows)),
+            duration_ms=column(
+                "duration_ms", (-1 if r.end_ns is None else r.duration_ms for r in rows)
+            ),
+            event_count=column("event_count", (r.event_count for r in rows)),
+            page_views=column("page_views", (r.page_views for r in rows)),
+            interactions=column("interactions", (r.interactions for r in rows)),
+            friction_events=column("friction_events", (r.friction_events for r in rows)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.session_ids)
+
+    def total_friction(self) -> int:
+        """Total friction events across all sessions"""
+        return int(self.friction_events.sum(dtype=np.int64))
+
+    def mean_duration_ms(self) -> float:
+        """Mean duration of ended sessions (0.0 if none have ended)"""
+        ended = self.duration_ms[self.duration_ms >= 0]
+        return float(ended.mean()) if ended.size else 0.0
+
+
+class SessionRingBuffer:
+    """
+    Fixed-capacity ring of session summary records for streaming to a sink
+
+    Storage is one preallocated structured array (SUMMARY_DTYPE plus the
+    session id), so steady-state pushes allocate nothing. When the reader
+    falls a full ring behind, the oldest records are overwritten.
+    """
+
+    __slots__ = ("buf", "head", "tail", "mask", "_staging")
+
+    def __init__(self, capacity: int = 4096):
+        size = 1 << max(0, capacity - 1).bit_length()  # round up to a power of two
+        self.buf = np.zeros(size, dtype=_RING_DTYPE)
+        self.head = 0  # next write position
+        self.tail = 0  # next read position
+        self.mask = size - 1
+        self._staging = np.zeros((), dtype=_RING_DTYPE)  # validates a record before it lands
+
+    def push(self, summary: SessionSummary):
+        """Append a summary, dropping the oldest record if the ring is full"""
+        # Fill the staging record first so a value that doesn't fit its column
+        # raises (OverflowError, numpy >= 2) before any slot of the ring is touched
+        self._staging[()] = (
+            summary.session_id,
+            summary.start_ns,
+            -1 if summary.end_ns is None else summary.duration_ms,
+            summary.event_count,
+            summary.page_views,
+            summary.interactions,
+            summary.friction_events,
+        )
+        self.buf[self.head & self.mask] = self._staging
+        self.head += 1
+        if self.head - self.tail > self.mask + 1:
+            self.tail += 1
+
+    def drain(self, n: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Consume up to n records (all pending by default)
+
+        Yields at most two contiguous slices (the ring may wrap). Slices are
+        views into the ring and are only valid until the next push.
+        """
+        pending = self.head - self.tail
+        n = pending if n is None else min(n, pending)
+        while n > 0:
+            start = self.tail & self.mask
+            count = min(n, len(self.buf) - start)
+            self.tail += count
+            n -= count
+            yield self.buf[start : start + count]
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+
+class PatternType(str, Enum):
+    """Friction pattern type enumeration"""
+
+    PERFORMANCE_DEGRADATION = "performance_degradation"
+    AFFORDANCE_CONFUSION = "affordance_confusion"
+    COGNITIVE_OVERLOAD = "cognitive_overload"
+    EXPECTATION_MISMATCH = "expectation_mismatch"
+
+
+class FrictionTemplate(IntEnum):
+    """Friction description templates (indexes into _FRICTION_TEMPLATES)"""
+
+    SLOW_LOAD = 0
+    HIGH_LATENCY = 1
+    RAPID_CLICK = 2
+    QUICK_REVERSAL = 3
+    FORM_ABANDONED = 4
+    ERROR = 5
+    REPEATED_REVERSALS = 6
+    TEXT = 7  # Free text, e.g. a description read back from serialized output
+
+
+_FRICTION_TEMPLATES: tuple[str, ...] = (
+    "Slow page load detected: {}ms",
+    "High latency for {}: {}ms",
+    "Rapid clicking on '{}' suggests unclear affordance or missing feedback",
+    "Quick navigation reversal suggests user didn't find expected content",
+    "Form abandoned after completing {}/{} fields",
+    "Error encountered: {}",
+    "Multiple navigation reversals ({}) suggest unmet expectations",
+    "{}",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class FrictionPattern:
+    """
+    Detected friction pattern
+
+    Only the template id and its arguments are stored; description is
+    formatted on access and is what gets serialized. Serialized patterns
+    validate back as free-text (TEXT) templates.
+    """
+
+    __pydantic_config__ = _MODEL_CONFIG
+
+    pattern_type: PatternType
     severity: float  # 0.0 - 1.0
-    timestamp: datetime
-    description: str
+    timestamp: Ts
     event_id: str
+    template_id: Annotated[FrictionTemplate, Field(exclude=True)]
+    template_args: Annotated[tuple[str, ...], Field(exclude=True)] = ()
 
+    @computed_field
+    @property
+    def description(self) -> str:
+        """Human-readable description"""
+        return _FRICTION_TEMPLATES[self.template_id].format(*self.template_args)
 
-class IntentHypothesis(BaseModel):
+    @model_validator(mode="before")
+    @classmethod
+    def _from_description(cls, data: Any) -> Any:
+        """Accept serialized patterns, which carry description instead of the template"""
+        if isinstance(data, dict) and "template_id" not in data and "description" in data:
+            data = {
+                **data,
+                "template_id": FrictionTemplate.TEXT,
+                "template_args": (data["description"],),
+            }
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class IntentHypothesis:
     """User intent hypothesis"""
 
+    __pydantic_config__ = _MODEL_CONFIG
+
     hypothesis: str
     confidence: float  # 0.0 - 1.0
-    supporting_evidence: list[str]
-    timestamp: datetime
+    supporting_evidence: tuple[str, ...]
+    timestamp: Ts
 
 
-class InsightSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class InsightSummary:
     """Generated insight"""
 
+    __pydantic_config__ = _MODEL_CONFIG
+
     session_id: str
-    timestamp: datetime
-    intent_hypotheses: list[IntentHypothesis]
-    friction_patterns: list[FrictionPattern]
-    recommendations: list[str]
+    timestamp: Ts
+    intent_hypotheses: tuple[IntentHypothesis, ...]
+    friction_patterns: tuple[FrictionPattern, ...]
+    recommendations: tuple[str, ...]
     confidence_score: float
+
+    def recompute_confidence(self) -> float:
+        """Overall confidence score from the hypotheses and patterns"""
+        return insight_confidence(self.intent_hypotheses, len(self.friction_patterns))
+
+    @staticmethod
+    def write_parquet(insights: Iterable["InsightSummary"], path: str) -> int:
+        """Archive insights to a zstd-compressed Parquet file (requires pyarrow)"""
+        from src.models.archive import write_insights_parquet
+
+        return write_insights_parquet(insights, path)
+
+
+class InsightBuilder:
+    """Collects the pipeline's lists for one InsightSummary, frozen once by build()
+
+    Each stage assigns its result list to the matching attribute rather than
+    copying it in.
+    """
+
+    __slots__ = (
+        "session_id",
+        "timestamp",
+        "intent_hypotheses",
+        "friction_patterns",
+        "recommendations",
+    )
+
+    def __init__(self, session_id: str, timestamp: datetime):
+        self.session_id = session_id
+        self.timestamp = timestamp
+        self.intent_hypotheses: list[IntentHypothesis] = []
+        self.friction_patterns: list[FrictionPattern] = []
+        self.recommendations: list[str] = []
+
+    def build(self, confidence_score: float) -> InsightSummary:
+        """Freeze the accumulated lists into an InsightSummary"""
+        return InsightSummary(
+            self.session_id,
+            self.timestamp,
+            tuple(self.intent_hypotheses),
+            tuple(self.friction_patterns),
+            tuple(self.recommendations),
+            confidence_score,
+        )
+
+
+def insight_confidence(hypotheses: Sequence[IntentHypothesis], friction_count: int) -> float:
+    """Weighted confidence: best hypothesis confidence (70%), friction coverage (30%)"""
+    confidences = np.fromiter(
+        (h.confidence for h in hypotheses), dtype=np.float64, count=len(hypotheses)
+    )
+    intent_confidence = float(confidences.max()) if confidences.size else 0.0
+    # More friction patterns = more certainty in the analysis
+    friction_factor = min(1.0, friction_count / 10)
+    return round(intent_confidence * 0.7 + friction_factor * 0.3, 2)
+
+
+# Config for adapted types that carry none of their own (e.g. list[...]); without
+# it TypeAdapter builds their schema immediately
+_ADAPTER_CONFIG = ConfigDict(defer_build=True)
+
+
+@cache
+def adapter_for(model: type[T]) -> TypeAdapter[T]:
+    """Validator for a model, built on first use and reused afterwards"""
+    if hasattr(model, "__pydantic_config__"):
+        return TypeAdapter(model)
+    return TypeAdapter(model, config=_ADAPTER_CONFIG)
+
+
+# Shared boundary adapters; import these instead of building new TypeAdapters.
+# Their schemas are still built on first use (defer_build).
+SESSION_SUMMARY_ADAPTER: Final = adapter_for(SessionSummary)
+FRICTION_PATTERN_ADAPTER: Final = adapter_for(FrictionPattern)
+INTENT_HYPOTHESES_ADAPTER: Final = adapter_for(list[IntentHypothesis])
+INSIGHT_SUMMARY_ADAPTER: Final = adapter_for(InsightSummary)
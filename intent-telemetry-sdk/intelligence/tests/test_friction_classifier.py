@@ -0,0 +1,65 @@
+"""
+Tests for friction classification on client-supplied event data
+"""
+
+import math
+from src.models.event import EventRec, EventType
+from src.models.session import PatternType
+from src.analysis.friction_classifier import FrictionClassifier
+from src.analysis.session_reconstructor import ReconstructedSession
+
+
+def make_event(seq: int, event_type: EventType, data: dict) -> EventRec:
+    return EventRec(
+        type=event_type,
+        event_id=f"e{seq}",
+        session_id="s1",
+        ts=1_700_000_000.0 + seq,
+        seq=seq,
+        url="http://example.com",
+        page_title="Home",
+        data=data,
+    )
+
+
+def test_detects_friction_patterns():
+    session = ReconstructedSession(
+        "s1",
+        [
+            make_event(1, EventType.PERFORMANCE_LOAD, {"loadTime": 5000}),
+            make_event(2, EventType.PERFORMANCE_LATENCY, {"latency": 100, "operation": "op"}),
+            make_event(
+                3, EventType.FRICTION_FORM_ABANDONMENT, {"fieldsCompleted": 1, "totalFields": 4}
+            ),
+        ],
+    )
+
+    patterns = FrictionClassifier().analyze_session(session)
+
+    assert [(p.pattern_type, p.severity, p.description) for p in patterns] == [
+        (PatternType.PERFORMANCE_DEGRADATION, 0.5, "Slow page load detected: 5000ms"),
+        (PatternType.PERFORMANCE_DEGRADATION, 0.02, "High latency for op: 100ms"),
+        (PatternType.COGNITIVE_OVERLOAD, 0.75, "Form abandoned after completing 1/4 fields"),
+    ]
+
+
+def test_non_numeric_data_falls_back_to_defaults():
+    session = ReconstructedSession(
+        "s1",
+        [
+            make_event(1, EventType.PERFORMANCE_LOAD, {"loadTime": "n/a"}),
+            make_event(2, EventType.PERFORMANCE_LATENCY, {"latency": None}),
+            make_event(3, EventType.FRICTION_RAPID_CLICK, {"clickCount": True}),
+            make_event(4, EventType.FRICTION_FORM_ABANDONMENT, {"totalFields": 10**400}),
+        ],
+    )
+
+    patterns = FrictionClassifier().analyze_session(session)
+
+    assert all(not math.isnan(p.severity) for p in patterns)
+    assert [p.description for p in patterns] == [
+        "High latency for unknown: 0ms",
+        "Rapid clicking on 'unknown' suggests unclear affordance or missing feedback",
+        "Form abandoned after completing 0/1 fields",
+    ]
+    assert [p.severity for p in patterns] == [0.0, 0.0, 1.0]
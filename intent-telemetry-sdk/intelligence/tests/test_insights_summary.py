@@ -0,0 +1,40 @@
+"""
+Tests for the cross-session insights summary route
+"""
+
+import asyncio
+from src.api.routes import insights
+from src.analysis.session_reconstructor import SessionReconstructor
+from src.models.event import EventRec, EventType
+from src.models.session import InsightSummary
+
+
+class FakeGenerator:
+    """Insight generator whose run for one session is cancelled"""
+
+    def __init__(self, cancelled_session: str):
+        self.cancelled_session = cancelled_session
+
+    async def generate_insights(self, session):
+        if session.session_id == self.cancelled_session:
+            raise asyncio.CancelledError()
+        return InsightSummary(session.session_id, session.start_time, (), (), (), 0.5)
+
+
+async def test_cancelled_session_is_skipped(monkeypatch):
+    reconstructor = SessionReconstructor()
+    for session_id in ("s1", "s2"):
+        reconstructor.add_events(
+            [
+                EventRec(
+                    EventType.ACTION_CLICK, f"{session_id}-0", session_id, 1.7e9, 0, None, None, {}
+                )
+            ]
+        )
+    monkeypatch.setattr(insights, "session_reconstructor", reconstructor)
+
+    summary = await insights.get_all_insights_summary(FakeGenerator("s1"))
+
+    assert summary["total_sessions"] == 2
+    assert summary["analyzed_sessions"] == 1
+    assert [s["session_id"] for s in summary["sessions"]] == ["s2"]
@@ -0,0 +1,180 @@
+"""
+Tests for the session models and their boundary adapters
+"""
+
+from datetime import datetime, timezone
+import pytest
+from pydantic_core import SchemaValidator
+from src.models.session import (
+    INSIGHT_SUMMARY_ADAPTER,
+    INTENT_HYPOTHESES_ADAPTER,
+    FrictionPattern,
+    FrictionTemplate,
+    InsightSummary,
+    IntentHypothesis,
+    PatternType,
+    SessionRingBuffer,
+    SessionSummary,
+    SessionSummaryBatch,
+    SessionSummaryView,
+    adapter_for,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DAY_NS = 86_400 * 1_000_000_000
+
+
+def make_summary(session_id: str, page_views: int = 1, days: int = 1) -> SessionSummary:
+    return SessionSummary(session_id, 0, page_views + 2, page_views, 1, 1, days * DAY_NS)
+
+
+def test_iso_timestamps_are_parsed_at_the_boundary():
+    (hypothesis,) = INTENT_HYPOTHESES_ADAPTER.validate_python(
+        [
+            {
+                "hypothesis": "Checkout",
+                "confidence": 0.8,
+                "supporting_evidence": ["clicked pay"],
+                "timestamp": "2026-01-01T12:30:00.250+00:00",
+            }
+        ]
+    )
+
+    assert hypothesis.timestamp == datetime(2026, 1, 1, 12, 30, 0, 250000, tzinfo=timezone.utc)
+    assert hypothesis.supporting_evidence == ("clicked pay",)
+
+
+def test_non_iso_timestamps_fall_back_to_pydantic():
+    (hypothesis,) = INTENT_HYPOTHESES_ADAPTER.validate_python(
+        [
+            {
+                "hypothesis": "x",
+                "confidence": 0.5,
+                "supporting_evidence": [],
+                "timestamp": "1700000000",
+            }
+        ]
+    )
+
+    assert hypothesis.timestamp == datetime.fromtimestamp(1_700_000_000, tz=timezone.utc)
+
+
+def test_adapters_build_their_schema_on_first_use():
+    for adapter in (adapter_for(FrictionPattern), adapter_for(list[FrictionPattern])):
+        assert not isinstance(adapter.validator, SchemaValidator)
+
+    adapter = adapter_for(list[FrictionPattern])
+    (pattern,) = adapter.validate_python(
+        [
+            {
+                "pattern_type": "performance_degradation",
+                "severity": 1,
+                "timestamp": NOW,
+                "event_id": "e1",
+                "description": "slow",
+            }
+        ]
+    )
+
+    assert isinstance(adapter.validator, SchemaValidator)
+    assert pattern.description == "slow"
+
+
+def test_insight_json_round_trips_through_the_adapter():
+    insight = InsightSummary(
+        session_id="s1",
+        timestamp=NOW,
+        intent_hypotheses=(IntentHypothesis("Checkout", 0.9, ("a", "b"), NOW),),
+        friction_patterns=(
+            FrictionPattern(
+                PatternType.EXPECTATION_MISMATCH, 0.8, NOW, "e1", FrictionTemplate.ERROR, ("{x}",)
+            ),
+        ),
+        recommendations=("Fix errors",),
+        confidence_score=0.66,
+    )
+
+    data = INSIGHT_SUMMARY_ADAPTER.dump_json(insight)
+    restored = INSIGHT_SUMMARY_ADAPTER.validate_json(data)
+
+    assert "template_id" not in data.decode()
+    (pattern,) = restored.friction_patterns
+    assert pattern.template_id is FrictionTemplate.TEXT
+    assert pattern.description == "Error encountered: {x}"
+    assert INSIGHT_SUMMARY_ADAPTER.dump_json(restored) == data
+
+
+def test_summary_bytes_round_trip_through_the_view():
+    start_ns = 1_700_000_000 * 10**9
+    closed = SessionSummary("sess-é", start_ns, 2**32 - 1, 7, 3, 1, start_ns + 90 * DAY_NS)
+    still_open = SessionSummary("open", start_ns, 1, 1, 0, 0)
+
+    for summary in (closed, still_open):
+        buf = summary.to_bytes()
+        view = SessionSummaryView(buf)
+
+        assert SessionSummary.from_bytes(buf) == summary
+        assert view.materialize() == summary
+        assert (
+            view.session_id,
+            view.start_ns,
+            view.end_ns,
+            view.event_count,
+            view.page_views,
+            view.interactions,
+            view.friction_events,
+            view.duration_ms,
+        ) == (
+            summary.session_id,
+            summary.start_ns,
+            summary.end_ns,
+            summary.event_count,
+            summary.page_views,
+            summary.interactions,
+            summary.friction_events,
+            summary.duration_ms,
+        )
+
+    assert SessionSummaryView(still_open.to_bytes()).end_ns is None
+    assert SessionSummaryView(closed.to_bytes()).duration_ms == 90 * 86_400_000
+
+
+def test_summary_batch_holds_large_counts_and_long_sessions():
+    batch = SessionSummaryBatch.from_iter(
+        [make_summary("a", page_views=70_000, days=40), make_summary("b", days=1)]
+    )
+
+    assert batch.page_views.tolist() == [70_000, 1]
+    assert batch.duration_ms.tolist() == [40 * 86_400_000, 86_400_000]
+    assert batch.mean_duration_ms() == 20.5 * 86_400_000
+
+
+def test_summary_batch_rejects_counts_outside_uint32():
+    for count in (-1, 2**32):
+        with pytest.raises(OverflowError):
+            SessionSummaryBatch.from_iter([SessionSummary("bad", 0, count, 0, 0, 0)])
+
+
+def test_ring_buffer_drops_oldest_when_full():
+    ring = SessionRingBuffer(4)
+    for i in range(6):
+        ring.push(make_summary(f"s{i}", days=40))
+
+    assert len(ring) == 4
+    drained = [sid for chunk in ring.drain() for sid in chunk["session_id"].tolist()]
+    assert drained == ["s2", "s3", "s4", "s5"]
+    assert len(ring) == 0
+
+
+def test_ring_buffer_rejected_push_keeps_existing_records():
+    ring = SessionRingBuffer(2)
+    ring.push(make_summary("a"))
+    ring.push(make_summary("b"))
+
+    with pytest.raises(OverflowError):
+        ring.push(SessionSummary("bad", 0, -1, 0, 0, 0))
+
+    assert len(ring) == 2
+    drained = [tuple(record) for chunk in ring.drain() for record in chunk.tolist()]
+    assert [r[0] for r in drained] == ["a", "b"]
+    assert drained[0][3] == 3
@@ -0,0 +1,122 @@
+"""
+Tests for the spilling session store and its read path
+"""
+
+import os
+import pytest
+from src.models.event import EventRec, EventType
+from src.analysis import session_store
+from src.analysis.session_store import SessionStore
+from src.analysis.session_reconstructor import SessionReconstructor
+
+
+def make_events(session_id: str, count: int = 3) -> list:
+    return [
+        EventRec(
+            type=EventType.ACTION_CLICK,
+            event_id=f"{session_id}-{seq}",
+            session_id=session_id,
+            ts=1_700_000_000.0 + seq,
+            seq=seq,
+            url="http://example.com",
+            page_title="Home",
+            data={"target": "button", "clickCount": seq},
+        )
+        for seq in range(count)
+    ]
+
+
+def test_evicted_sessions_are_spilled_and_reloaded(tmp_path):
+    evicted = []
+    store = SessionStore(2, str(tmp_path / "spill.bin"), on_evict=evicted.append)
+    sessions = {f"s{i}": make_events(f"s{i}") for i in range(4)}
+    for session_id, events in sessions.items():
+        store[session_id] = events
+
+    assert evicted == ["s0", "s1"]
+    assert len(store) == 4
+    assert not store.is_hot("s0")
+    assert os.path.getsize(tmp_path / "spill.bin") > 0
+
+    # get() promotes the session back into memory
+    assert store.get("s0") == sessions["s0"]
+    assert store.is_hot("s0")
+    assert sorted(store) == sorted(sessions)
+    for session_id, events in sessions.items():
+        assert store[session_id] == events
+
+
+def test_reloaded_session_keeps_new_events(tmp_path):
+    store = SessionStore(1, str(tmp_path / "spill.bin"))
+    store["a"] = make_events("a", 2)
+    store["b"] = make_events("b", 2)
+
+    events = store.get("a")
+    events.append(make_events("a", 3)[-1])
+    store["b"]  # evicts "a" again, with the appended event
+
+    assert [e.seq for e in store.peek("a")] == [0, 1, 2]
+
+
+def test_peek_does_not_promote_or_respill(tmp_path):
+    store = SessionStore(2, str(tmp_path / "spill.bin"))
+    sessions = {f"s{i}": make_events(f"s{i}") for i in range(6)}
+    for session_id, events in sessions.items():
+        store[session_id] = events
+    size = os.path.getsize(tmp_path / "spill.bin")
+
+    for _ in range(3):
+        for session_id, events in sessions.items():
+            assert store.peek(session_id) == events
+
+    assert os.path.getsize(tmp_path / "spill.bin") == size
+    assert not store.is_hot("s0")
+    assert store.peek("missing") is None
+
+
+def test_reading_all_sessions_does_not_grow_spill_file(tmp_path):
+    spill_path = tmp_path / "spill.bin"
+    reconstructor = SessionReconstructor(max_hot_sessions=2, spill_path=str(spill_path))
+    for i in range(6):
+        reconstructor.add_events(make_events(f"s{i}"))
+    size = os.path.getsize(spill_path)
+
+    for _ in range(5):
+        sessions = reconstructor.get_all_sessions()
+        assert [len(s.events) for s in sessions] == [3] * 6
+
+    assert os.path.getsize(spill_path) == size
+    assert reconstructor.get_session_count() == 6
+    assert len(reconstructor.get_all_sessions(limit=4)) == 4
+
+
+def test_spilling_out_of_range_integers_keeps_both_sessions(tmp_path):
+    reconstructor = SessionReconstructor(max_hot_sessions=1, spill_path=str(tmp_path / "spill.bin"))
+    big = make_events("big", 1)
+    big[0].data = {"n": 10**29, "nested": [{"huge": 10**400}], "ok": 7}
+    reconstructor.add_events(big)
+    reconstructor.add_events(make_events("next", 1))
+
+    assert reconstructor.get_session_count() == 2
+    assert not reconstructor.sessions.is_hot("big")
+    (event,) = reconstructor.get_session("big").events
+    assert event.data == {"n": 1e29, "nested": [{"huge": str(10**400)}], "ok": 7}
+    assert [e.event_id for e in reconstructor.get_session("next").events] == ["next-0"]
+    reconstructor.close()
+
+
+def test_failed_spill_keeps_evicted_session(tmp_path, monkeypatch):
+    store = SessionStore(1, str(tmp_path / "spill.bin"))
+    store["a"] = make_events("a")
+
+    def fail(events):
+        raise OverflowError("can't encode")
+
+    monkeypatch.setattr(session_store, "_encode", fail)
+    with pytest.raises(OverflowError):
+        store["b"] = make_events("b")
+
+    assert store.is_hot("a")
+    assert len(store) == 1
+    assert store.get("a") == make_events("a")
+    store.close()